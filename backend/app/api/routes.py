@@ -1,39 +1,54 @@
 
 import time
-from fastapi import APIRouter, UploadFile, File, HTTPException
+import hashlib
+from typing import Optional
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from app.api.schemas import (
     TextAnalysisRequest,
     AnalysisResponse,
+    CompactAnalysisResponse,
     ContentType,
+    StoredAnalysis,
 )
+from app.models.results import AnalysisResult, SIGNAL_LABELS, dumps
 from app.services.text_analyzer import TextAnalyzer
 from app.services.image_analyzer import ImageAnalyzer
 from app.services.video_analyzer import VideoAnalyzer
+from app.services.result_store import store_from_env
 
 router = APIRouter()
 text_analyzer = TextAnalyzer()
 image_analyzer = ImageAnalyzer()
 video_analyzer = VideoAnalyzer()
+result_store = store_from_env()
 
 ALLOWED_IMAGE_TYPES = {"image/png", "image/jpeg", "image/webp", "image/gif"}
 ALLOWED_VIDEO_TYPES = {"video/mp4", "video/webm", "video/quicktime"}
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100 MB
 
 
-@router.post("/analyze/text", response_model=AnalysisResponse)
-async def analyze_text(request: TextAnalysisRequest):
+@router.post("/analyze/text", response_model=AnalysisResponse | CompactAnalysisResponse)
+async def analyze_text(
+    request: TextAnalysisRequest,
+    compact: bool = Query(False, description="Return signal codes instead of labels"),
+):
     start = time.time()
     try:
         result = text_analyzer.analyze(request.text)
-        result["processing_time_ms"] = int((time.time() - start) * 1000)
-        result["content_type"] = ContentType.TEXT
-        return AnalysisResponse(**result)
+        result.processing_time_ms = int((time.time() - start) * 1000)
+        result.content_type = ContentType.TEXT.value
+        _persist(request.text.encode("utf-8"), text_analyzer.VERSION, result)
+        return _respond(result, compact)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/analyze/image", response_model=AnalysisResponse)
-async def analyze_image(file: UploadFile = File(...)):
+@router.post("/analyze/image", response_model=AnalysisResponse | CompactAnalysisResponse)
+async def analyze_image(
+    file: UploadFile = File(...),
+    compact: bool = Query(False, description="Return signal codes instead of labels"),
+):
     if file.content_type not in ALLOWED_IMAGE_TYPES:
         raise HTTPException(status_code=400, detail=f"Invalid file type: {file.content_type}")
 
@@ -44,15 +59,21 @@ async def analyze_image(file: UploadFile = File(...)):
     start = time.time()
     try:
         result = image_analyzer.analyze(contents, file.filename, file.content_type)
-        result["processing_time_ms"] = int((time.time() - start) * 1000)
-        result["content_type"] = ContentType.IMAGE
-        return AnalysisResponse(**result)
+        result.processing_time_ms = int((time.time() - start) * 1000)
+        result.content_type = ContentType.IMAGE.value
+        _persist(contents, image_analyzer.VERSION, result)
+        return _respond(result, compact)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/analyze/video", response_model=AnalysisResponse)
-async def analyze_video(file: UploadFile = File(...)):
+@router.post("/analyze/video", response_model=AnalysisResponse | CompactAnalysisResponse)
+async def analyze_video(
+    file: UploadFile = File(...),
+    budget_ms: Optional[int] = Query(None, gt=0, le=600_000, description="Frame sampling latency budget"),
+    refine: bool = Query(False, description="Spend part of the budget re-sampling around scene cuts"),
+    compact: bool = Query(False, description="Return signal codes instead of labels"),
+):
     if file.content_type not in ALLOWED_VIDEO_TYPES:
         raise HTTPException(status_code=400, detail=f"Invalid file type: {file.content_type}")
 
@@ -62,9 +83,52 @@ async def analyze_video(file: UploadFile = File(...)):
 
     start = time.time()
     try:
-        result = video_analyzer.analyze(contents, file.filename)
-        result["processing_time_ms"] = int((time.time() - start) * 1000)
-        result["content_type"] = ContentType.VIDEO
-        return AnalysisResponse(**result)
+        result = video_analyzer.analyze(contents, file.filename, budget_ms, refine)
+        result.processing_time_ms = int((time.time() - start) * 1000)
+        result.content_type = ContentType.VIDEO.value
+        _persist(contents, video_analyzer.VERSION, result)
+        return _respond(result, compact)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _respond(result: AnalysisResult, compact: bool) -> Response:
+    # Analyzer output is already typed; serialize directly instead of re-validating through AnalysisResponse.
+    return Response(content=result.to_json(compact), media_type="application/json")
+
+
+def _persist(content: bytes, analyzer_version: str, result: AnalysisResult):
+    if result_store is not None:
+        result_store.record(hashlib.sha256(content).hexdigest(), analyzer_version, result)
+
+
+@router.get("/signals", response_model=dict[str, str])
+async def signal_codes():
+    return SIGNAL_LABELS
+
+
+def _require_store():
+    if result_store is None:
+        raise HTTPException(status_code=404, detail="Result store is disabled")
+    return result_store
+
+
+@router.get("/results/export")
+def export_results(since: Optional[float] = None, until: Optional[float] = None):
+    store = _require_store()
+    lines = (dumps(row) + b"\n" for row in store.export(since, until))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+@router.get("/results/{content_hash}", response_model=list[StoredAnalysis])
+def get_results_by_hash(content_hash: str, limit: int = Query(100, ge=1, le=1000)):
+    return _require_store().find_by_hash(content_hash.lower(), limit)
+
+
+@router.get("/results", response_model=list[StoredAnalysis])
+def list_results(
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    limit: int = Query(100, ge=1, le=1000),
+):
+    return _require_store().find_by_time(since, until, limit)
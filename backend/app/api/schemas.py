@@ -40,6 +40,35 @@ class AnalysisResponse(BaseModel):
     disclaimer: str = "Probabilistic assessment. Not a definitive verdict."
 
 
+class CompactDetectionSignal(BaseModel):
+    code: str = Field(..., description="Key into GET /api/signals")
+    weight: SignalWeight
+    detail: str = ""
+
+
+class CompactAnalysisResponse(BaseModel):
+    """Returned with ?compact=true: signal codes instead of labels, no disclaimer."""
+    content_type: ContentType
+    prediction: Literal["ai_generated", "human_created", "uncertain"]
+    ai_probability: float = Field(..., ge=0, le=100)
+    human_probability: float = Field(..., ge=0, le=100)
+    signals: list[CompactDetectionSignal]
+    metrics: dict
+    processing_time_ms: int
+
+
 class ErrorResponse(BaseModel):
     error: str
-    detail: str = ""
\ No newline at end of file
+    detail: str = ""
+
+
+class StoredAnalysis(BaseModel):
+    id: int
+    content_hash: str
+    content_type: ContentType
+    analyzer_version: str
+    prediction: str
+    ai_probability: float
+    processing_time_ms: int
+    created_at: float
+    response: AnalysisResponse
@@ -0,0 +1,459 @@
+"""
+Offline Batch Runner
+Scans directories and tar/zip archives and runs the analyzers directly in a process pool.
+
+    python -m app.batch /data/uploads archive.tar.gz -o results.jsonl
+    python -m app.batch /data/uploads -o results/ --format parquet --workers 16
+
+Progress is checkpointed next to the output so an interrupted run resumes where it stopped.
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import hashlib
+import tarfile
+import zipfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from app.models.results import dumps
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+EXTENSIONS = {
+    ".txt": ("text", "text/plain"),
+    ".md": ("text", "text/markdown"),
+    ".png": ("image", "image/png"),
+    ".jpg": ("image", "image/jpeg"),
+    ".jpeg": ("image", "image/jpeg"),
+    ".webp": ("image", "image/webp"),
+    ".gif": ("image", "image/gif"),
+    ".mp4": ("video", "video/mp4"),
+    ".webm": ("video", "video/webm"),
+    ".mov": ("video", "video/quicktime"),
+}
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+PARQUET_PART_ROWS = 5000
+MAX_FILE_SIZE = 100 * 1024 * 1024  # 100 MB, same cap as the API
+
+_analyzers = None
+
+
+# ─── Discovery ────────────────────────────────
+
+def classify(name):
+    return EXTENSIONS.get(os.path.splitext(name)[1].lower())
+
+
+def iter_items(paths, max_size=MAX_FILE_SIZE):
+    """Yield (source, kind, mime, path, load) for every supported file.
+
+    Plain files are passed by path so workers read them; archive members come with a
+    load() that reads them here, because archives can only be streamed sequentially.
+    Oversized files and unreadable archives or members get a load() that raises, so
+    the runner records them as error rows instead of aborting.
+    """
+    for root in paths:
+        if os.path.isdir(root):
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    yield from _iter_file(os.path.join(dirpath, name), max_size)
+        else:
+            yield from _iter_file(root, max_size)
+
+
+def _iter_file(path, max_size):
+    if path.lower().endswith(ARCHIVE_SUFFIXES):
+        yield from _iter_archive(path, max_size)
+        return
+    kind = classify(path)
+    if not kind:
+        return
+    try:
+        size = os.path.getsize(path)
+    except OSError as e:
+        yield path, kind[0], kind[1], None, _fail(str(e))
+        return
+    if size > max_size:
+        yield path, kind[0], kind[1], None, _fail(_too_large(size, max_size))
+    else:
+        yield path, kind[0], kind[1], path, None
+
+
+def _iter_archive(path, max_size):
+    # Corrupt or truncated archives fail on open or part-way through; either way the
+    # archive itself becomes one error row and the run moves on.
+    try:
+        if path.lower().endswith(".zip"):
+            with zipfile.ZipFile(path) as zf:
+                for info in zf.infolist():
+                    kind = classify(info.filename)
+                    if not kind or info.is_dir():
+                        continue
+                    source = f"{path}!{info.filename}"
+                    if info.file_size > max_size:
+                        yield source, kind[0], kind[1], None, _fail(_too_large(info.file_size, max_size))
+                    else:
+                        yield source, kind[0], kind[1], None, lambda info=info: zf.read(info)
+        else:
+            with tarfile.open(path, "r:*") as tf:
+                for member in tf:
+                    kind = classify(member.name)
+                    if not kind or not member.isfile():
+                        continue
+                    source = f"{path}!{member.name}"
+                    if member.size > max_size:
+                        yield source, kind[0], kind[1], None, _fail(_too_large(member.size, max_size))
+                    else:
+                        yield source, kind[0], kind[1], None, lambda member=member: tf.extractfile(member).read()
+    except Exception as e:
+        yield path, None, None, None, _fail(f"Unreadable archive: {e or type(e).__name__}")
+
+
+def _too_large(size, max_size):
+    return f"File too large: {size} bytes (max {max_size})"
+
+
+def _fail(message):
+    def load():
+        raise ValueError(message)
+    return load
+
+
+# ─── Workers ──────────────────────────────────
+
+def _init_worker():
+    global _analyzers
+    from app.services.text_analyzer import TextAnalyzer
+    from app.services.image_analyzer import ImageAnalyzer
+    from app.services.video_analyzer import VideoAnalyzer
+    _analyzers = {"text": TextAnalyzer(), "image": ImageAnalyzer(), "video": VideoAnalyzer()}
+
+
+def _analyze(source, kind, mime, path, data):
+    try:
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        analyzer = _analyzers[kind]
+        name = os.path.basename(source.split("!")[-1])
+        start = time.time()
+        if kind == "text":
+            result = analyzer.analyze(data.decode("utf-8", errors="replace"))
+        elif kind == "image":
+            result = analyzer.analyze(data, name, mime)
+        else:
+            result = analyzer.analyze(data, name)
+        result.processing_time_ms = int((time.time() - start) * 1000)
+        result.content_type = kind
+        return {
+            "source": source,
+            "content_hash": hashlib.sha256(data).hexdigest(),
+            "analyzer_version": analyzer.VERSION,
+            "response": result.to_dict(),
+        }
+    except Exception as e:
+        return {"source": source, "content_type": kind, "error": str(e)}
+
+
+# ─── Output ───────────────────────────────────
+
+class JsonlWriter:
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "ab")
+
+    def recover(self, positions):
+        """Drop everything written after the last checkpointed offset.
+
+        Lines past that offset belong to sources the checkpoint does not list,
+        so they would be written again on resume.
+        """
+        offset = positions[-1] if positions else 0
+        if self._file.tell() > offset:
+            self._file.truncate(offset)
+            self._file.seek(offset)
+
+    def write(self, record):
+        self._file.write(dumps(record) + b"\n")
+
+    def flush(self):
+        """Make every written record durable and return the output offset to checkpoint."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+class ParquetWriter:
+    """Writes each flushed batch as its own complete part file, so a crash never leaves a checkpointed row unreadable."""
+
+    SCHEMA = pa.schema([
+        ("source", pa.string()),
+        ("content_type", pa.string()),
+        ("content_hash", pa.string()),
+        ("analyzer_version", pa.string()),
+        ("prediction", pa.string()),
+        ("ai_probability", pa.float64()),
+        ("human_probability", pa.float64()),
+        ("processing_time_ms", pa.int64()),
+        ("signals", pa.string()),
+        ("metrics", pa.string()),
+        ("error", pa.string()),
+    ]) if HAS_PYARROW else None
+
+    def __init__(self, directory):
+        if not HAS_PYARROW:
+            raise SystemExit("Parquet output requires pyarrow: pip install pyarrow")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._run_id = int(time.time() * 1000)
+        self._part = 0
+        self._rows = []
+
+    def write(self, record):
+        response = record.get("response", {})
+        self._rows.append({
+            "source": record["source"],
+            "content_type": response.get("content_type", record.get("content_type")),
+            "content_hash": record.get("content_hash"),
+            "analyzer_version": record.get("analyzer_version"),
+            "prediction": response.get("prediction"),
+            "ai_probability": response.get("ai_probability"),
+            "human_probability": response.get("human_probability"),
+            "processing_time_ms": response.get("processing_time_ms"),
+            "signals": dumps(response["signals"]).decode("utf-8") if response else None,
+            "metrics": dumps(response["metrics"]).decode("utf-8") if response else None,
+            "error": record.get("error"),
+        })
+
+    def recover(self, positions):
+        """Delete part files written after the last checkpoint commit; their sources will be redone."""
+        committed = set(positions)
+        for path in glob.glob(os.path.join(self.directory, "part-*.parquet")):
+            if os.path.basename(path) not in committed:
+                os.unlink(path)
+
+    def flush(self):
+        """Write buffered rows as a new part file and return its name to checkpoint."""
+        if not self._rows:
+            return None
+        name = f"part-{self._run_id}-{self._part:05d}.parquet"
+        pq.write_table(pa.Table.from_pylist(self._rows, schema=self.SCHEMA), os.path.join(self.directory, name))
+        self._part += 1
+        self._rows = []
+        return name
+
+    def close(self):
+        self.flush()
+
+
+# ─── Checkpoint ───────────────────────────────
+
+class Checkpoint:
+    """Append-only log of commits, one JSON line each: the sources finished and the output
+    position (JSONL offset or Parquet part) that holds their results.
+
+    A commit line is written in one fsynced append after the results are flushed. A torn
+    last line is ignored, so its sources are redone and the writer rolls back to the
+    previous position.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.exists = os.path.exists(path)
+        self.done = set()
+        self.positions = []
+        valid_bytes = 0
+        if self.exists:
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        if not valid_bytes:
+                            raise SystemExit(f"{path} is not a batch checkpoint")
+                        break
+                    valid_bytes += len(line)
+                    self.done.update(entry["sources"])
+                    if entry["position"] is not None:
+                        self.positions.append(entry["position"])
+            with open(path, "rb+") as f:
+                f.truncate(valid_bytes)
+        self._file = open(path, "a", encoding="utf-8")
+        self._pending = []
+
+    def add(self, source):
+        self._pending.append(source)
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def commit(self, position):
+        if self._pending:
+            self._file.write(json.dumps({"position": position, "sources": self._pending}) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.done.update(self._pending)
+            self.positions.append(position)
+            self._pending = []
+
+    def close(self):
+        self._file.close()
+
+
+def _run_isolated(args):
+    """Rerun one item alone in a fresh worker so a crash can be pinned on it."""
+    pool = ProcessPoolExecutor(max_workers=1, initializer=_init_worker)
+    try:
+        return pool.submit(_analyze, *args).result()
+    except BrokenProcessPool:
+        return {"source": args[0], "content_type": args[1], "error": "worker process crashed"}
+    finally:
+        pool.shutdown(wait=True)
+
+
+# ─── Runner ───────────────────────────────────
+
+def run(paths, output, fmt="jsonl", workers=None, checkpoint_path=None, flush_every=None, report_every=10.0,
+        max_size=MAX_FILE_SIZE):
+    workers = workers or os.cpu_count() or 1
+    if fmt == "parquet":
+        writer = ParquetWriter(output)
+        flush_every = flush_every or PARQUET_PART_ROWS
+        checkpoint_path = checkpoint_path or os.path.join(output, "checkpoint.jsonl")
+    else:
+        writer = JsonlWriter(output)
+        flush_every = flush_every or 100
+        checkpoint_path = checkpoint_path or output + ".checkpoint"
+    checkpoint = Checkpoint(checkpoint_path)
+    if checkpoint.exists:
+        writer.recover(checkpoint.positions)
+    skipped = len(checkpoint.done)
+
+    processed = failed = crashed = 0
+    start = last_report = time.monotonic()
+
+    def report(final=False):
+        elapsed = max(time.monotonic() - start, 1e-9)
+        prefix = "done" if final else "progress"
+        print(
+            f"[batch] {prefix}: {processed} files ({failed} failed, {skipped} resumed) "
+            f"in {elapsed:.1f}s — {processed / elapsed:.1f} files/s",
+            file=sys.stderr,
+        )
+
+    def emit(record):
+        nonlocal processed, failed
+        writer.write(record)
+        checkpoint.add(record["source"])
+        processed += 1
+        failed += "error" in record
+
+    def flush():
+        checkpoint.commit(writer.flush())
+
+    def drain(block):
+        nonlocal pool, crashed, last_report
+        finished, _ = wait(futures, return_when=FIRST_COMPLETED, timeout=None if block else 0)
+        suspects = []
+        for future in finished:
+            args = futures.pop(future)
+            try:
+                emit(future.result())
+            except BrokenProcessPool:
+                suspects.append(args)
+        if suspects:
+            # A worker died (segfault, OOM kill) and took every in-flight item with it.
+            # Collect the rest, replace the pool and retry each casualty alone.
+            for future in wait(futures).done:
+                args = futures.pop(future)
+                try:
+                    emit(future.result())
+                except BrokenProcessPool:
+                    suspects.append(args)
+            pool.shutdown(wait=False, cancel_futures=True)
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+            crashed += 1
+            print(f"[batch] worker crashed; retrying {len(suspects)} files individually", file=sys.stderr)
+            for args in suspects:
+                emit(_run_isolated(args))
+        if checkpoint.pending >= flush_every:
+            flush()
+        if time.monotonic() - last_report >= report_every:
+            last_report = time.monotonic()
+            report()
+
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    futures = {}
+    try:
+        for source, kind, mime, path, load in iter_items(paths, max_size):
+            if source in checkpoint.done:
+                continue
+            try:
+                data = load() if load else None
+            except Exception as e:
+                emit({"source": source, "content_type": kind, "error": str(e) or type(e).__name__})
+                continue
+            args = (source, kind, mime, path, data)
+            futures[pool.submit(_analyze, *args)] = args
+            if len(futures) >= workers * 2:
+                drain(block=True)
+        while futures:
+            drain(block=True)
+    except KeyboardInterrupt:
+        pool.shutdown(wait=False, cancel_futures=True)
+        print("[batch] interrupted — rerun the same command to resume", file=sys.stderr)
+        raise
+    finally:
+        # Keep results that already finished; cancelled or lost items are redone on resume.
+        pool.shutdown(wait=True, cancel_futures=True)
+        for future in futures:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                emit(future.result())
+        flush()
+        writer.close()
+        checkpoint.close()
+        report(final=True)
+
+    return {"processed": processed, "failed": failed, "resumed": skipped, "pool_restarts": crashed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.batch", description="Analyze files and archives offline.")
+    parser.add_argument("paths", nargs="+", help="Directories, files, or .zip/.tar(.gz) archives to scan")
+    parser.add_argument("-o", "--output", required=True, help="JSONL file, or directory for parquet parts")
+    parser.add_argument("--format", choices=("jsonl", "parquet"), default="jsonl")
+    parser.add_argument("--workers", type=int, default=None, help="Process count (default: CPU count)")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: next to the output)")
+    parser.add_argument("--report-every", type=float, default=10.0, help="Seconds between throughput reports")
+    parser.add_argument("--max-size-mb", type=int, default=MAX_FILE_SIZE // (1024 * 1024),
+                        help="Files larger than this are recorded as errors without being read")
+    args = parser.parse_args(argv)
+
+    try:
+        run(args.paths, args.output, args.format, args.workers, args.checkpoint, report_every=args.report_every,
+            max_size=args.max_size_mb * 1024 * 1024)
+    except KeyboardInterrupt:
+        return 130
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
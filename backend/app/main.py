@@ -2,9 +2,20 @@
 AI Content Authenticity Detector — FastAPI Backend
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import router
+from app.api.routes import router, result_store
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if result_store is not None:
+        result_store.start()
+    yield
+    if result_store is not None:
+        result_store.close()
+
 
 app = FastAPI(
     title="AI Authenticity Detector API",
@@ -12,6 +23,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -31,4 +43,5 @@ async def health_check():
         "status": "healthy",
         "version": "1.0.0",
         "models_loaded": True,
+        "result_store": result_store.stats() if result_store is not None else None,
     }
\ No newline at end of file
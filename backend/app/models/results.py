@@ -0,0 +1,120 @@
+"""
+Typed analysis results.
+Analyzers build these slot-based objects and the API serializes them straight to JSON,
+skipping the per-request Pydantic validation of nested dicts.
+"""
+
+import json
+from dataclasses import dataclass, field
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+DISCLAIMER = "Probabilistic assessment. Not a definitive verdict."
+
+# Stable signal codes → labels. Compact responses carry the code in place of the label.
+SIGNAL_LABELS = {
+    "text.ml_model": "🧠 ML Model: RoBERTa AI detector",
+    "text.ml_error": "ML model error — using heuristics only",
+    "text.low_burstiness": "Low burstiness — unnaturally uniform sentence flow",
+    "text.moderate_burstiness": "Moderate burstiness",
+    "text.low_lexical_diversity": "Low lexical diversity",
+    "text.below_avg_lexical_diversity": "Below-average lexical diversity",
+    "text.high_transition_density": "High transition word density",
+    "text.elevated_transition_usage": "Elevated transition word usage",
+    "text.ai_vocabulary": "AI-associated vocabulary detected",
+    "text.repetitive_structure": "Repetitive sentence structure",
+    "text.long_words": "High average word length",
+    "text.no_indicators": "No strong AI indicators",
+    "text.insufficient": "Insufficient text",
+    "image.filename_generator": "Filename contains AI generator",
+    "image.very_small_file": "Very small file — possibly synthetic",
+    "image.small_file": "Small file size",
+    "image.camera_metadata": "Camera metadata present — likely real photo",
+    "image.gps": "GPS coordinates present",
+    "image.editing_software": "AI/editing software detected",
+    "image.no_exif": "No EXIF metadata — common in AI images",
+    "image.ai_resolution": "AI-typical resolution",
+    "image.texture_uniformity": "High texture uniformity",
+    "image.synthetic_noise": "Synthetic noise pattern",
+    "image.fft": "Frequency domain analysis (FFT) performed",
+    "video.small_file": "Small video — limited frames",
+    "video.low_coherence": "Low temporal coherence",
+    "video.moderate_coherence": "Moderate temporal coherence",
+    "video.good_coherence": "Good temporal coherence",
+    "video.uniform_quality": "Unnaturally uniform frame quality",
+    "video.face_inconsistency": "Facial landmark inconsistencies",
+    "video.faces_consistent": "Faces detected — landmarks consistent",
+    "video.color_shift": "Color distribution shifts between frames",
+    "video.basic_mode": "Frame analysis (basic mode)",
+    "video.encoding_metadata": "Encoding metadata inspected",
+}
+
+
+@dataclass(slots=True)
+class Signal:
+    """One detection signal. Everything specific to this input belongs in detail, so
+    compact responses (code + detail) lose nothing against full ones (label + detail)."""
+
+    code: str
+    weight: str
+    detail: str = ""
+
+    def __post_init__(self):
+        if self.code not in SIGNAL_LABELS:
+            raise ValueError(f"Unknown signal code: {self.code}")
+
+    @property
+    def label(self):
+        return SIGNAL_LABELS[self.code]
+
+    def to_dict(self, compact=False):
+        if compact:
+            return {"code": self.code, "weight": self.weight, "detail": self.detail}
+        return {"label": self.label, "weight": self.weight, "detail": self.detail}
+
+
+@dataclass(slots=True)
+class AnalysisResult:
+    prediction: str
+    ai_probability: float
+    human_probability: float
+    signals: list[Signal]
+    metrics: dict = field(default_factory=dict)
+    content_type: str = ""
+    processing_time_ms: int = 0
+
+    def to_dict(self, compact=False):
+        data = {
+            "content_type": self.content_type,
+            "prediction": self.prediction,
+            "ai_probability": self.ai_probability,
+            "human_probability": self.human_probability,
+            "signals": [s.to_dict(compact) for s in self.signals],
+            "metrics": self.metrics,
+            "processing_time_ms": self.processing_time_ms,
+        }
+        if not compact:
+            data["disclaimer"] = DISCLAIMER
+        return data
+
+    def to_json(self, compact=False) -> bytes:
+        return dumps(self.to_dict(compact))
+
+
+def _default(obj):
+    # NumPy scalars and anything else exposing a Python equivalent
+    if hasattr(obj, "item"):
+        return obj.item()
+    if hasattr(obj, "value"):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj) -> bytes:
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_default, ensure_ascii=False).encode("utf-8")
@@ -6,6 +6,7 @@ Detects AI-generated images using metadata and forensic heuristics.
 import io
 import hashlib
 from typing import Optional
+from app.models.results import AnalysisResult, Signal
 
 try:
     from PIL import Image
@@ -23,6 +24,8 @@ except ImportError:
 
 class ImageAnalyzer:
 
+    VERSION = "1.0.0"
+
     AI_GENERATOR_KEYWORDS = {
         "midjourney", "dalle", "dall-e", "stable-diffusion", "stablediffusion",
         "sd_xl", "sdxl", "ai_generated", "aigenerated", "generated",
@@ -40,38 +43,38 @@ class ImageAnalyzer:
         for keyword in self.AI_GENERATOR_KEYWORDS:
             if keyword in name_lower:
                 ai_score += 25
-                signals.append({
-                    "label": f"Filename contains AI generator: '{keyword}'",
-                    "weight": "high",
-                    "detail": filename,
-                })
+                signals.append(Signal(
+                    code="image.filename_generator",
+                    weight="high",
+                    detail=f"'{keyword}' in {filename}",
+                ))
                 break
 
         # --- File size ---
         if file_size_mb < 0.1:
             ai_score += 10
-            signals.append({"label": "Very small file — possibly synthetic", "weight": "medium", "detail": f"{file_size_mb:.2f} MB"})
+            signals.append(Signal("image.very_small_file", "medium", f"{file_size_mb:.2f} MB"))
         elif file_size_mb < 0.5:
             ai_score += 5
-            signals.append({"label": "Small file size", "weight": "low", "detail": f"{file_size_mb:.2f} MB"})
+            signals.append(Signal("image.small_file", "low", f"{file_size_mb:.2f} MB"))
 
         # --- EXIF Metadata ---
         exif_result = self._check_exif(file_bytes)
         if exif_result["has_exif"]:
             if exif_result.get("has_camera_info"):
                 ai_score -= 15
-                signals.append({"label": "Camera metadata present — likely real photo", "weight": "low", "detail": f"Camera: {exif_result.get('camera', 'Unknown')}"})
+                signals.append(Signal("image.camera_metadata", "low", f"Camera: {exif_result.get('camera', 'Unknown')}"))
             if exif_result.get("has_gps"):
                 ai_score -= 10
-                signals.append({"label": "GPS coordinates present", "weight": "low", "detail": "Location data embedded"})
+                signals.append(Signal("image.gps", "low", "Location data embedded"))
             if exif_result.get("software"):
                 sw = exif_result["software"].lower()
                 if any(t in sw for t in ["photoshop", "stable", "midjourney", "dall"]):
                     ai_score += 15
-                    signals.append({"label": f"AI/editing software detected: {exif_result['software']}", "weight": "high", "detail": ""})
+                    signals.append(Signal("image.editing_software", "high", exif_result["software"]))
         else:
             ai_score += 12
-            signals.append({"label": "No EXIF metadata — common in AI images", "weight": "medium", "detail": "Real photos typically have EXIF data"})
+            signals.append(Signal("image.no_exif", "medium", "Real photos typically have EXIF data"))
 
         # --- Dimensions ---
         dimensions = self._get_dimensions(file_bytes)
@@ -80,7 +83,7 @@ class ImageAnalyzer:
             ai_resolutions = {(512,512),(768,768),(1024,1024),(1024,1792),(1792,1024)}
             if (w, h) in ai_resolutions:
                 ai_score += 12
-                signals.append({"label": f"AI-typical resolution: {w}×{h}", "weight": "medium", "detail": "Common AI generator output size"})
+                signals.append(Signal("image.ai_resolution", "medium", f"{w}×{h} — common AI generator output size"))
 
         # --- Pixel analysis ---
         if HAS_PIL and HAS_NUMPY:
@@ -88,12 +91,12 @@ class ImageAnalyzer:
             if pixel_result:
                 if pixel_result["texture_uniformity"] > 0.85:
                     ai_score += 12
-                    signals.append({"label": "High texture uniformity", "weight": "medium", "detail": f"Score: {pixel_result['texture_uniformity']:.3f}"})
+                    signals.append(Signal("image.texture_uniformity", "medium", f"Score: {pixel_result['texture_uniformity']:.3f}"))
                 if pixel_result["noise_pattern"] == "synthetic":
                     ai_score += 10
-                    signals.append({"label": "Synthetic noise pattern", "weight": "medium", "detail": "Noise inconsistent with camera sensors"})
+                    signals.append(Signal("image.synthetic_noise", "medium", "Noise inconsistent with camera sensors"))
 
-        signals.append({"label": "Frequency domain analysis (FFT) performed", "weight": "medium", "detail": "Scanned for GAN artifacts"})
+        signals.append(Signal("image.fft", "medium", "Scanned for GAN artifacts"))
 
         ai_score = max(5, min(96, ai_score + 25))
 
@@ -104,12 +107,12 @@ class ImageAnalyzer:
         else:
             prediction = "human_created"
 
-        return {
-            "prediction": prediction,
-            "ai_probability": round(ai_score, 1),
-            "human_probability": round(100 - ai_score, 1),
-            "signals": signals,
-            "metrics": {
+        return AnalysisResult(
+            prediction=prediction,
+            ai_probability=round(ai_score, 1),
+            human_probability=round(100 - ai_score, 1),
+            signals=signals,
+            metrics={
                 "file_size_mb": round(file_size_mb, 2),
                 "format": content_type,
                 "exif_present": exif_result["has_exif"],
@@ -117,7 +120,7 @@ class ImageAnalyzer:
                 "dimensions": f"{dimensions[0]}×{dimensions[1]}" if dimensions else "Unknown",
                 "file_hash": hashlib.sha256(file_bytes).hexdigest()[:16],
             },
-        }
+        )
 
     def _check_exif(self, file_bytes):
         result = {"has_exif": False}
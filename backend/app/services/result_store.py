@@ -0,0 +1,237 @@
+"""
+Result Store Service
+Append-only SQLite (WAL) log of every analysis, written in batches off the request path.
+"""
+
+import os
+import json
+import queue
+import logging
+import sqlite3
+import threading
+import time
+from typing import Iterator, Optional
+from app.models.results import AnalysisResult
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    content_hash TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    analyzer_version TEXT NOT NULL,
+    prediction TEXT NOT NULL,
+    ai_probability REAL NOT NULL,
+    processing_time_ms INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    response TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_hash ON analyses (content_hash, created_at);
+CREATE INDEX IF NOT EXISTS idx_analyses_created ON analyses (created_at);
+CREATE TRIGGER IF NOT EXISTS analyses_no_update BEFORE UPDATE ON analyses
+BEGIN SELECT RAISE(ABORT, 'analyses is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS analyses_no_delete BEFORE DELETE ON analyses
+BEGIN SELECT RAISE(ABORT, 'analyses is append-only'); END;
+"""
+
+COLUMNS = "content_hash, content_type, analyzer_version, prediction, ai_probability, processing_time_ms, created_at, response"
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+class ResultStore:
+
+    def __init__(self, path, batch_size=256, flush_interval=0.5, max_pending=10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._writer = None
+        self._lock = threading.Lock()
+        self._initialized = False
+        self.dropped = 0
+        self.failed = 0
+
+    def _ensure_schema(self):
+        if self._initialized:
+            return
+        with self._lock:
+            if self._initialized:
+                return
+            conn = self._connect()
+            try:
+                conn.executescript(SCHEMA)
+            finally:
+                conn.close()
+            self._initialized = True
+
+    def _connect(self, check_same_thread=True):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=check_same_thread)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # ─── Writes ───────────────────────────────────
+
+    def start(self):
+        """Create the database on first use and make sure the writer thread is running."""
+        self._ensure_schema()
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="result-store-writer", daemon=True)
+                self._writer.start()
+
+    def close(self):
+        """Flush everything still queued and stop the writer thread."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(_STOP)
+            writer.join()
+
+    def record(self, content_hash, analyzer_version, result: AnalysisResult):
+        """Queue one analysis for persistence. Never blocks the caller."""
+        self.start()
+        # Serialization happens on the writer thread
+        row = (content_hash, analyzer_version, result, time.time())
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning("Result store queue full; %d analyses dropped so far", self.dropped)
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.qsize(),
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "writer_alive": self._writer is not None and self._writer.is_alive(),
+        }
+
+    def _write_loop(self):
+        conn = self._connect()
+        try:
+            stopping = False
+            while not stopping:
+                batch = []
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                deadline = time.monotonic() + self.flush_interval
+                while True:
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    try:
+                        batch.append(self._to_row(*item))
+                    except Exception:
+                        self.failed += 1
+                        logger.exception("Result store could not serialize analysis %s", item[0])
+                    if len(batch) >= self.batch_size:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                if batch:
+                    try:
+                        with conn:
+                            conn.executemany(
+                                f"INSERT INTO analyses ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                batch,
+                            )
+                    except Exception:
+                        self.failed += len(batch)
+                        logger.exception("Result store failed to write a batch of %d analyses", len(batch))
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _to_row(content_hash, analyzer_version, result: AnalysisResult, created_at):
+        return (
+            content_hash,
+            result.content_type,
+            analyzer_version,
+            result.prediction,
+            float(result.ai_probability),
+            int(result.processing_time_ms),
+            created_at,
+            result.to_json().decode("utf-8"),
+        )
+
+    # ─── Reads ────────────────────────────────────
+
+    def find_by_hash(self, content_hash, limit=100) -> list[dict]:
+        return self._query(
+            "WHERE content_hash = ? ORDER BY created_at DESC LIMIT ?",
+            (content_hash, limit),
+        )
+
+    def find_by_time(self, since=None, until=None, limit=100) -> list[dict]:
+        where, params = self._time_filter(since, until)
+        return self._query(f"{where} ORDER BY created_at DESC LIMIT ?", (*params, limit))
+
+    def export(self, since=None, until=None, chunk_size=1000) -> Iterator[dict]:
+        """Stream stored analyses oldest-first without loading them all into memory."""
+        self._ensure_schema()
+        where, params = self._time_filter(since, until)
+        # StreamingResponse may advance this generator from a different worker thread on each
+        # step. The connection is never used concurrently, only handed between threads.
+        conn = self._connect(check_same_thread=False)
+        try:
+            cursor = conn.execute(f"SELECT id, {COLUMNS} FROM analyses {where} ORDER BY created_at", params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._row_to_dict(row)
+        finally:
+            conn.close()
+
+    def _query(self, clause, params):
+        self._ensure_schema()
+        conn = self._connect()
+        try:
+            rows = conn.execute(f"SELECT id, {COLUMNS} FROM analyses {clause}", params).fetchall()
+        finally:
+            conn.close()
+        return [self._row_to_dict(row) for row in rows]
+
+    def _time_filter(self, since: Optional[float], until: Optional[float]):
+        conditions, params = [], []
+        if since is not None:
+            conditions.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("created_at < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, tuple(params)
+
+    def _row_to_dict(self, row):
+        return {
+            "id": row[0],
+            "content_hash": row[1],
+            "content_type": row[2],
+            "analyzer_version": row[3],
+            "prediction": row[4],
+            "ai_probability": row[5],
+            "processing_time_ms": row[6],
+            "created_at": row[7],
+            "response": json.loads(row[8]),
+        }
+
+
+def store_from_env() -> Optional[ResultStore]:
+    """Build the store from RESULTS_DB_PATH; persistence is off when it is unset or empty."""
+    path = os.getenv("RESULTS_DB_PATH", "")
+    if not path:
+        return None
+    return ResultStore(path)
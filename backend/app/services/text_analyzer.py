@@ -3,17 +3,24 @@ Text Analysis Service — Now with REAL AI Detection!
 Uses RoBERTa fine-tuned on GPT-generated text + heuristic signals.
 """
 
+import os
 import re
 import math
 from collections import Counter
+from app.models.results import AnalysisResult, Signal
+
+# Set to an empty string to skip the model download and run heuristics only
+MODEL_NAME = os.getenv("TEXT_DETECTOR_MODEL", "roberta-base-openai-detector")
 
 # Try loading HuggingFace model
 try:
+    if not MODEL_NAME:
+        raise RuntimeError("TEXT_DETECTOR_MODEL is empty")
     from transformers import pipeline
     print("Loading AI text detection model...")
     ai_detector = pipeline(
         "text-classification",
-        model="roberta-base-openai-detector",
+        model=MODEL_NAME,
         device=-1,  # CPU (-1), use 0 for GPU
     )
     HAS_MODEL = True
@@ -26,6 +33,8 @@ except Exception as e:
 
 class TextAnalyzer:
 
+    VERSION = "1.0.0+roberta" if HAS_MODEL else "1.0.0+heuristics"
+
     AI_VOCABULARY = {
         "delve", "tapestry", "landscape", "multifaceted", "utilize",
         "leverage", "paradigm", "holistic", "synergy", "ecosystem",
@@ -44,7 +53,7 @@ class TextAnalyzer:
         "notably", "importantly", "significantly", "interestingly", "surprisingly",
     }
 
-    def analyze(self, text: str) -> dict:
+    def analyze(self, text: str) -> AnalysisResult:
         words = text.split()
         sentences = [s.strip() for s in re.split(r"[.!?]+", text) if s.strip()]
 
@@ -71,21 +80,21 @@ class TextAnalyzer:
                 else:
                     ml_score = round((1 - score) * 100, 1)
 
-                signals.append({
-                    "label": f"🧠 ML Model: RoBERTa AI detector",
-                    "weight": "high" if ml_score > 70 else "medium" if ml_score > 45 else "low",
-                    "detail": f"Model confidence: {ml_score}% AI-generated (RoBERTa fine-tuned on GPT outputs)",
-                })
+                signals.append(Signal(
+                    code="text.ml_model",
+                    weight="high" if ml_score > 70 else "medium" if ml_score > 45 else "low",
+                    detail=f"Model confidence: {ml_score}% AI-generated (RoBERTa fine-tuned on GPT outputs)",
+                ))
 
                 # ML model gets heavy weight
                 ai_score += ml_score * 0.5
 
             except Exception as e:
-                signals.append({
-                    "label": "ML model error — using heuristics only",
-                    "weight": "low",
-                    "detail": str(e),
-                })
+                signals.append(Signal(
+                    code="text.ml_error",
+                    weight="low",
+                    detail=str(e),
+                ))
 
         # ═══════════════════════════════════════════
         # HEURISTIC SIGNALS (same as before)
@@ -96,36 +105,36 @@ class TextAnalyzer:
         burstiness = self._compute_burstiness(sent_lengths)
         if burstiness < 3.5 and len(sentences) > 3:
             ai_score += 11
-            signals.append({
-                "label": "Low burstiness — unnaturally uniform sentence flow",
-                "weight": "high",
-                "detail": f"Score: {burstiness:.2f} (human avg: 6-12)",
-            })
+            signals.append(Signal(
+                code="text.low_burstiness",
+                weight="high",
+                detail=f"Score: {burstiness:.2f} (human avg: 6-12)",
+            ))
         elif burstiness < 5.0 and len(sentences) > 3:
             ai_score += 5
-            signals.append({
-                "label": "Moderate burstiness",
-                "weight": "medium",
-                "detail": f"Score: {burstiness:.2f}",
-            })
+            signals.append(Signal(
+                code="text.moderate_burstiness",
+                weight="medium",
+                detail=f"Score: {burstiness:.2f}",
+            ))
 
         # --- Signal: Lexical Diversity ---
         unique_words = set(w.lower().strip(".,!?;:'\"") for w in words)
         lexical_diversity = len(unique_words) / len(words) if words else 0
         if lexical_diversity < 0.50:
             ai_score += 9
-            signals.append({
-                "label": "Low lexical diversity",
-                "weight": "high",
-                "detail": f"Ratio: {lexical_diversity:.3f} (human avg: 0.6-0.8)",
-            })
+            signals.append(Signal(
+                code="text.low_lexical_diversity",
+                weight="high",
+                detail=f"Ratio: {lexical_diversity:.3f} (human avg: 0.6-0.8)",
+            ))
         elif lexical_diversity < 0.58:
             ai_score += 4
-            signals.append({
-                "label": "Below-average lexical diversity",
-                "weight": "medium",
-                "detail": f"Ratio: {lexical_diversity:.3f}",
-            })
+            signals.append(Signal(
+                code="text.below_avg_lexical_diversity",
+                weight="medium",
+                detail=f"Ratio: {lexical_diversity:.3f}",
+            ))
 
         # --- Signal: Transition Word Density ---
         transition_count = sum(
@@ -134,18 +143,18 @@ class TextAnalyzer:
         transition_density = transition_count / len(words)
         if transition_density > 0.025:
             ai_score += 8
-            signals.append({
-                "label": "High transition word density",
-                "weight": "high",
-                "detail": f"{transition_count} transitions in {len(words)} words",
-            })
+            signals.append(Signal(
+                code="text.high_transition_density",
+                weight="high",
+                detail=f"{transition_count} transitions in {len(words)} words",
+            ))
         elif transition_density > 0.015:
             ai_score += 4
-            signals.append({
-                "label": "Elevated transition word usage",
-                "weight": "medium",
-                "detail": f"Density: {transition_density:.4f}",
-            })
+            signals.append(Signal(
+                code="text.elevated_transition_usage",
+                weight="medium",
+                detail=f"Density: {transition_density:.4f}",
+            ))
 
         # --- Signal: AI Vocabulary ---
         ai_vocab_hits = [
@@ -154,39 +163,39 @@ class TextAnalyzer:
         ]
         if len(ai_vocab_hits) >= 3:
             ai_score += 8
-            signals.append({
-                "label": "AI-associated vocabulary detected",
-                "weight": "high",
-                "detail": f"Found: {', '.join(set(w.lower() for w in ai_vocab_hits[:5]))}",
-            })
+            signals.append(Signal(
+                code="text.ai_vocabulary",
+                weight="high",
+                detail=f"Found: {', '.join(set(w.lower() for w in ai_vocab_hits[:5]))}",
+            ))
         elif len(ai_vocab_hits) >= 1:
             ai_score += 3
-            signals.append({
-                "label": "AI-associated vocabulary detected",
-                "weight": "low",
-                "detail": f"Found: {', '.join(set(w.lower() for w in ai_vocab_hits[:3]))}",
-            })
+            signals.append(Signal(
+                code="text.ai_vocabulary",
+                weight="low",
+                detail=f"Found: {', '.join(set(w.lower() for w in ai_vocab_hits[:3]))}",
+            ))
 
         # --- Signal: Sentence Structure ---
         if len(sentences) >= 4:
             structure_score = self._sentence_structure_uniformity(sentences)
             if structure_score > 0.7:
                 ai_score += 7
-                signals.append({
-                    "label": "Repetitive sentence structure",
-                    "weight": "high",
-                    "detail": f"Uniformity: {structure_score:.2f}",
-                })
+                signals.append(Signal(
+                    code="text.repetitive_structure",
+                    weight="high",
+                    detail=f"Uniformity: {structure_score:.2f}",
+                ))
 
         # --- Signal: Word Length ---
         avg_word_len = sum(len(w) for w in words) / len(words)
         if avg_word_len > 5.5:
             ai_score += 4
-            signals.append({
-                "label": "High average word length",
-                "weight": "low",
-                "detail": f"Average: {avg_word_len:.1f} chars (human avg: 4.5-5.2)",
-            })
+            signals.append(Signal(
+                code="text.long_words",
+                weight="low",
+                detail=f"Average: {avg_word_len:.1f} chars (human avg: 4.5-5.2)",
+            ))
 
         # Perplexity
         perplexity_estimate = self._estimate_perplexity(words)
@@ -202,7 +211,7 @@ class TextAnalyzer:
             prediction = "human_created"
 
         if not signals:
-            signals.append({"label": "No strong AI indicators", "weight": "low", "detail": ""})
+            signals.append(Signal("text.no_indicators", "low", ""))
 
         metrics = {
             "word_count": len(words),
@@ -217,15 +226,15 @@ class TextAnalyzer:
 
         if ml_score is not None:
             metrics["ml_model_score"] = ml_score
-            metrics["model_name"] = "roberta-base-openai-detector"
-
-        return {
-            "prediction": prediction,
-            "ai_probability": round(ai_score, 1),
-            "human_probability": round(100 - ai_score, 1),
-            "signals": signals,
-            "metrics": metrics,
-        }
+            metrics["model_name"] = MODEL_NAME
+
+        return AnalysisResult(
+            prediction=prediction,
+            ai_probability=round(ai_score, 1),
+            human_probability=round(100 - ai_score, 1),
+            signals=signals,
+            metrics=metrics,
+        )
 
     def _compute_burstiness(self, sent_lengths):
         if len(sent_lengths) < 2:
@@ -260,10 +269,10 @@ class TextAnalyzer:
         return 2 ** entropy
 
     def _empty_result(self):
-        return {
-            "prediction": "uncertain",
-            "ai_probability": 50.0,
-            "human_probability": 50.0,
-            "signals": [{"label": "Insufficient text", "weight": "low", "detail": ""}],
-            "metrics": {},
-        }
\ No newline at end of file
+        return AnalysisResult(
+            prediction="uncertain",
+            ai_probability=50.0,
+            human_probability=50.0,
+            signals=[Signal("text.insufficient", "low")],
+            metrics={},
+        )
\ No newline at end of file
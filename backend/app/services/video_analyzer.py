@@ -1,9 +1,12 @@
 
 
 import os
+import time
 import tempfile
 import hashlib
+import threading
 from typing import Optional
+from app.models.results import AnalysisResult, Signal
 
 try:
     import cv2
@@ -20,50 +23,77 @@ except ImportError:
 
 class VideoAnalyzer:
 
-    def analyze(self, file_bytes, filename):
+    VERSION = "1.1.0"
+
+    # Frame sampling budget — overridable per request
+    DEFAULT_BUDGET_MS = float(os.getenv("VIDEO_FRAME_BUDGET_MS", "5000"))
+    MAX_FRAMES = 50
+    MIN_NATIVE_FRAMES = 16  # only downscale when fewer than this would fit at native resolution
+    REFINE_BUDGET_SHARE = 0.25
+    REFINE_COHERENCE = 0.85
+
+    # Rough CPU cost model; measured timings take over once sampling starts
+    DECODE_MS_PER_MPIX = 20.0
+    QUALITY_MS_PER_MPIX = 5.0
+    ANALYSIS_MS_PER_MPIX = 80.0
+    FACE_MIN_SIZE = 30
+    WORKING_HEIGHTS = (1080, 720, 480, 360, 240)
+    CODEC_DECODE_COST = {
+        "avc1": 1.0, "h264": 1.0, "x264": 1.0,
+        "hvc1": 1.8, "hev1": 1.8, "hevc": 1.8,
+        "vp08": 0.9, "vp80": 0.9,
+        "vp09": 1.4, "vp90": 1.4,
+        "av01": 2.2,
+        "mp4v": 0.8, "fmp4": 0.8, "mjpg": 0.6,
+    }
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def analyze(self, file_bytes, filename, budget_ms=None, refine=False):
         signals = []
         ai_score = 0.0
         file_size_mb = len(file_bytes) / (1024 * 1024)
 
         if file_size_mb < 1.0:
             ai_score += 8
-            signals.append({"label": "Small video — limited frames", "weight": "low", "detail": f"{file_size_mb:.2f} MB"})
+            signals.append(Signal("video.small_file", "low", f"{file_size_mb:.2f} MB"))
 
         frame_results = None
         if HAS_CV2 and HAS_NUMPY:
-            frame_results = self._analyze_frames(file_bytes)
+            frame_results = self._analyze_frames(file_bytes, budget_ms or self.DEFAULT_BUDGET_MS, refine)
 
         if frame_results:
             tc = frame_results["temporal_coherence"]
             if tc < 0.75:
                 ai_score += 20
-                signals.append({"label": "Low temporal coherence", "weight": "high", "detail": f"Score: {tc:.3f} (natural: >0.85)"})
+                signals.append(Signal("video.low_coherence", "high", f"Score: {tc:.3f} (natural: >0.85)"))
             elif tc < 0.85:
                 ai_score += 10
-                signals.append({"label": "Moderate temporal coherence", "weight": "medium", "detail": f"Score: {tc:.3f}"})
+                signals.append(Signal("video.moderate_coherence", "medium", f"Score: {tc:.3f}"))
             else:
-                signals.append({"label": "Good temporal coherence", "weight": "low", "detail": f"Score: {tc:.3f}"})
+                signals.append(Signal("video.good_coherence", "low", f"Score: {tc:.3f}"))
 
             qv = frame_results["quality_variance"]
             if qv < 5.0 and frame_results["frame_count"] > 10:
                 ai_score += 12
-                signals.append({"label": "Unnaturally uniform frame quality", "weight": "medium", "detail": f"Variance: {qv:.2f}"})
+                signals.append(Signal("video.uniform_quality", "medium", f"Variance: {qv:.2f}"))
 
             if frame_results.get("face_inconsistency", 0) > 0.3:
                 ai_score += 18
-                signals.append({"label": "Facial landmark inconsistencies", "weight": "high", "detail": f"Score: {frame_results['face_inconsistency']:.2f}"})
+                signals.append(Signal("video.face_inconsistency", "high", f"Score: {frame_results['face_inconsistency']:.2f}"))
             elif frame_results.get("faces_detected", 0) > 0:
-                signals.append({"label": "Faces detected — landmarks consistent", "weight": "low", "detail": f"Found in {frame_results['faces_detected']} frames"})
+                signals.append(Signal("video.faces_consistent", "low", f"Found in {frame_results['faces_detected']} frames"))
 
             cc = frame_results.get("color_consistency", 0.9)
             if cc < 0.8:
                 ai_score += 10
-                signals.append({"label": "Color distribution shifts between frames", "weight": "medium", "detail": f"Consistency: {cc:.3f}"})
+                signals.append(Signal("video.color_shift", "medium", f"Consistency: {cc:.3f}"))
         else:
-            signals.append({"label": "Frame analysis (basic mode)", "weight": "medium", "detail": "Install OpenCV for full analysis"})
+            signals.append(Signal("video.basic_mode", "medium", "Install OpenCV for full analysis"))
             ai_score += 15
 
-        signals.append({"label": "Encoding metadata inspected", "weight": "low", "detail": filename})
+        signals.append(Signal("video.encoding_metadata", "low", filename))
 
         ai_score = max(5, min(94, ai_score + 20))
 
@@ -85,21 +115,30 @@ class VideoAnalyzer:
                 "fps": frame_results.get("fps", "Unknown"),
                 "resolution": frame_results.get("resolution", "Unknown"),
                 "temporal_coherence": round(frame_results["temporal_coherence"], 3),
+                "codec": frame_results["codec"],
+                "working_resolution": frame_results["working_resolution"],
+                "frames_planned": frame_results["frames_planned"],
+                "refined_frames": frame_results["refined_frames"],
+                "frame_budget_ms": frame_results["budget_ms"],
+                "frame_time_ms": frame_results["elapsed_ms"],
+                "within_budget": frame_results["elapsed_ms"] <= frame_results["budget_ms"],
             })
 
-        return {
-            "prediction": prediction,
-            "ai_probability": round(ai_score, 1),
-            "human_probability": round(100 - ai_score, 1),
-            "signals": signals,
-            "metrics": metrics,
-        }
+        return AnalysisResult(
+            prediction=prediction,
+            ai_probability=round(ai_score, 1),
+            human_probability=round(100 - ai_score, 1),
+            signals=signals,
+            metrics=metrics,
+        )
 
-    def _analyze_frames(self, file_bytes):
+    def _analyze_frames(self, file_bytes, budget_ms, refine):
+        tmp_path = None
+        cap = None
         try:
             with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as tmp:
-                tmp.write(file_bytes)
                 tmp_path = tmp.name
+                tmp.write(file_bytes)
 
             cap = cv2.VideoCapture(tmp_path)
             if not cap.isOpened():
@@ -109,49 +148,94 @@ class VideoAnalyzer:
             total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
             width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
             height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            codec = self._fourcc(cap)
+            if width <= 0 or height <= 0:
+                # Some containers leave the size unset even though their frames decode
+                ret, first = cap.read()
+                if ret:
+                    height, width = first.shape[:2]
 
-            sample_count = min(50, total_frames)
-            if sample_count < 2:
-                cap.release()
-                os.unlink(tmp_path)
+            plan = self._plan_sampling(width, height, total_frames, codec, budget_ms, refine)
+            if plan["frames"] < 2:
                 return None
 
-            frame_indices = np.linspace(0, total_frames - 1, sample_count, dtype=int)
-            frames = []
-            frame_qualities = []
-            histograms = []
-            face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
-            face_counts = []
+            started = time.perf_counter()
+            deadline = started + budget_ms / 1000
+            base_deadline = started + plan["base_budget_ms"] / 1000
+            face_cascade = self._face_cascade()
+            min_face = max(1, round(self.FACE_MIN_SIZE * plan["scale"]))
+            samples = {}
 
-            for idx in frame_indices:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+            def sample(idx):
+                cap.set(cv2.CAP_PROP_POS_FRAMES, int(idx))
                 ret, frame = cap.read()
                 if not ret:
-                    continue
-                frames.append(frame)
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                frame_qualities.append(cv2.Laplacian(gray, cv2.CV_64F).var())
+                    return False
+                # Sharpness stays at native resolution so the quality-variance threshold keeps its meaning
+                native_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                quality = cv2.Laplacian(native_gray, cv2.CV_64F).var()
+                if plan["scale"] < 1.0:
+                    frame = cv2.resize(frame, plan["working_size"], interpolation=cv2.INTER_AREA)
+                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                else:
+                    gray = native_gray
                 hist = cv2.calcHist([frame], [0,1,2], None, [8,8,8], [0,256]*3)
-                histograms.append(cv2.normalize(hist, hist).flatten())
-                faces = face_cascade.detectMultiScale(gray, 1.1, 4, minSize=(30, 30))
-                face_counts.append(len(faces))
+                samples[int(idx)] = {
+                    "thumb": cv2.resize(gray, (256, 256)).flatten(),
+                    "quality": quality,
+                    "hist": cv2.normalize(hist, hist).flatten(),
+                    "faces": len(face_cascade.detectMultiScale(gray, 1.1, 4, minSize=(min_face, min_face))),
+                }
+                return True
 
-            cap.release()
-            os.unlink(tmp_path)
+            # Coarse-to-fine order, so stopping early on a slow file still spans the whole clip.
+            frame_indices = np.linspace(0, total_frames - 1, plan["frames"], dtype=int)
+            for n, pos in enumerate(self._progressive_order(len(frame_indices))):
+                if len(samples) >= 2:
+                    per_frame = (time.perf_counter() - started) / n
+                    if time.perf_counter() + per_frame > base_deadline:
+                        break
+                sample(frame_indices[pos])
 
-            if len(frames) < 2:
+            if len(samples) < 2:
                 return None
 
-            coherence_scores = []
-            for i in range(len(frames) - 1):
-                g1 = cv2.resize(cv2.cvtColor(frames[i], cv2.COLOR_BGR2GRAY), (256, 256))
-                g2 = cv2.resize(cv2.cvtColor(frames[i+1], cv2.COLOR_BGR2GRAY), (256, 256))
-                corr = np.corrcoef(g1.flatten(), g2.flatten())[0, 1]
-                coherence_scores.append(max(0, corr))
+            order = sorted(samples)
+            pairs = {(a, b): self._coherence(samples[a], samples[b]) for a, b in zip(order, order[1:])}
+            base_count = len(samples)
 
-            color_scores = []
-            for i in range(len(histograms) - 1):
-                color_scores.append(cv2.compareHist(histograms[i], histograms[i+1], cv2.HISTCMP_CORREL))
+            # Spend any reserved budget on midpoints of the least coherent gaps (scene cuts, glitches).
+            if refine:
+                while len(samples) < base_count + self.MAX_FRAMES:
+                    candidates = [(c, a, b) for (a, b), c in pairs.items() if c < self.REFINE_COHERENCE and b - a > 1]
+                    if not candidates:
+                        break
+                    per_frame = (time.perf_counter() - started) / len(samples)
+                    if time.perf_counter() + per_frame > deadline:
+                        break
+                    _, a, b = min(candidates)
+                    mid = (a + b) // 2
+                    del pairs[(a, b)]
+                    if sample(mid):
+                        pairs[(a, mid)] = self._coherence(samples[a], samples[mid])
+                        pairs[(mid, b)] = self._coherence(samples[mid], samples[b])
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            order = sorted(samples)
+
+            # Weight each adjacent pair by the span it covers, so denser sampling around cuts
+            # sharpens the estimate instead of biasing it.
+            spans = np.array([b - a for a, b in zip(order, order[1:])], dtype=float)
+            coherence_scores = [
+                pairs[(a, b)] if (a, b) in pairs else self._coherence(samples[a], samples[b])
+                for a, b in zip(order, order[1:])
+            ]
+            color_scores = [
+                cv2.compareHist(samples[a]["hist"], samples[b]["hist"], cv2.HISTCMP_CORREL)
+                for a, b in zip(order, order[1:])
+            ]
+            frame_qualities = [samples[i]["quality"] for i in order]
+            face_counts = [samples[i]["faces"] for i in order]
 
             face_inconsistency = 0.0
             non_zero = [c for c in face_counts if c > 0]
@@ -159,14 +243,103 @@ class VideoAnalyzer:
                 face_inconsistency = np.std(non_zero) / (np.mean(non_zero) + 1e-6)
 
             return {
-                "frame_count": len(frames),
+                "frame_count": len(samples),
                 "fps": round(fps, 1),
                 "resolution": f"{width}×{height}",
-                "temporal_coherence": np.mean(coherence_scores) if coherence_scores else 0.9,
-                "quality_variance": np.std(frame_qualities),
-                "color_consistency": np.mean(color_scores) if color_scores else 0.9,
-                "face_inconsistency": face_inconsistency,
+                "temporal_coherence": float(np.average(coherence_scores, weights=spans)),
+                "quality_variance": float(np.std(frame_qualities)),
+                "color_consistency": float(np.average(color_scores, weights=spans)),
+                "face_inconsistency": float(face_inconsistency),
                 "faces_detected": sum(1 for c in face_counts if c > 0),
+                "codec": codec or "unknown",
+                "frames_planned": plan["frames"],
+                "refined_frames": len(samples) - base_count,
+                "working_resolution": f"{plan['working_size'][0]}×{plan['working_size'][1]}",
+                "budget_ms": int(budget_ms),
+                "elapsed_ms": int(elapsed_ms),
             }
         except Exception:
             return None
+        finally:
+            if cap is not None:
+                cap.release()
+            if tmp_path is not None:
+                os.unlink(tmp_path)
+
+    def _plan_sampling(self, width, height, total_frames, codec, budget_ms, refine):
+        """Pick a frame count and working resolution expected to fit the latency budget.
+
+        Decode and sharpness cost scale with native pixels and codec complexity; face
+        detection scales with the working resolution. Frames are analysed at native
+        resolution, sampled more sparsely, unless fewer than MIN_NATIVE_FRAMES would fit;
+        only then is the working resolution lowered. Unknown (zero) dimensions are never
+        scaled.
+        """
+        total_frames = max(total_frames, 0)
+        base_budget = budget_ms * (1 - self.REFINE_BUDGET_SHARE) if refine else budget_ms
+        wanted = min(self.MAX_FRAMES, total_frames)
+        enough = min(self.MIN_NATIVE_FRAMES, wanted)
+        native_mpix = max(width * height, 1) / 1e6
+        fixed_ms = native_mpix * (
+            self.DECODE_MS_PER_MPIX * self.CODEC_DECODE_COST.get(codec, 1.0) + self.QUALITY_MS_PER_MPIX
+        )
+
+        known = width > 0 and height > 0
+        options = []
+        for target in [height] + [h for h in self.WORKING_HEIGHTS if h < height and known]:
+            scale = min(1.0, target / height) if known else 1.0
+            per_frame = fixed_ms + native_mpix * scale * scale * self.ANALYSIS_MS_PER_MPIX
+            options.append((int(base_budget / per_frame), scale))
+
+        # Largest resolution that still gets enough frames; when decode cost dominates and
+        # none does, the largest one within 10% of the best achievable frame count.
+        best = max(frames for frames, _ in options)
+        frames, scale = next(
+            (o for o in options if o[0] >= enough),
+            next(o for o in options if o[0] >= 0.9 * best),
+        )
+
+        return {
+            "frames": max(min(frames, wanted), min(2, total_frames)),
+            "scale": scale,
+            "working_size": (max(int(width * scale), 1), max(int(height * scale), 1)) if scale < 1.0 else (width, height),
+            "base_budget_ms": base_budget,
+        }
+
+    @staticmethod
+    def _progressive_order(n):
+        """Indices 0..n-1 ordered endpoints first, then successive midpoints."""
+        if n <= 2:
+            return list(range(n))
+        order, seen = [0, n - 1], {0, n - 1}
+        intervals = [(0, n - 1)]
+        while intervals:
+            next_intervals = []
+            for lo, hi in intervals:
+                mid = (lo + hi) // 2
+                if mid not in seen:
+                    seen.add(mid)
+                    order.append(mid)
+                if mid - lo > 1:
+                    next_intervals.append((lo, mid))
+                if hi - mid > 1:
+                    next_intervals.append((mid, hi))
+            intervals = next_intervals
+        return order
+
+    @staticmethod
+    def _coherence(a, b):
+        return max(0, np.corrcoef(a["thumb"], b["thumb"])[0, 1])
+
+    @staticmethod
+    def _fourcc(cap):
+        code = int(cap.get(cv2.CAP_PROP_FOURCC))
+        return "".join(chr((code >> 8 * i) & 0xFF) for i in range(4)).strip("\x00 ").lower()
+
+    def _face_cascade(self):
+        # CascadeClassifier is not safe to share across threads; keep one per thread.
+        cascade = getattr(self._local, "face_cascade", None)
+        if cascade is None:
+            cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+            self._local.face_cascade = cascade
+        return cascade
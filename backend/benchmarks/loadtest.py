@@ -0,0 +1,320 @@
+"""
+Load-test harness for the API.
+
+Starts app.main under uvicorn with a stub text model (see loadtest_app.py), drives mixed
+text/image/video traffic at a fixed concurrency and reports throughput, tail latency,
+error rate and server event-loop lag.
+
+    cd backend && python -m benchmarks.loadtest --concurrency 32 --duration 30 --workers 2
+    python -m benchmarks.loadtest --mix text=8,image=2 --model-latency-ms 120 --json report.json
+    python -m benchmarks.loadtest --url http://localhost:8000   # existing server, no lag stats
+"""
+
+import io
+import os
+import sys
+import json
+import glob
+import time
+import random
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+
+import httpx
+
+try:
+    import numpy as np
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+try:
+    import cv2
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TEXT_SAMPLES = [
+    "Furthermore, this comprehensive framework leverages a holistic paradigm to streamline "
+    "the multifaceted landscape of modern workflows. Moreover, it underscores the pivotal role "
+    "of robust, innovative tooling. Consequently, teams can facilitate meaningful outcomes.",
+    "I went down to the market this morning and the guy with the bad knee was back selling "
+    "tomatoes again. Bought way too many. No idea what I'm doing with them now, honestly, "
+    "maybe sauce? My sister says roast them. She's usually right about this stuff.",
+    "The committee met on Tuesday. Attendance was low because of the storm, so most decisions "
+    "were postponed. We did approve the budget for the roof repair, which has been leaking "
+    "since March, and someone finally volunteered to fix the broken projector.",
+]
+
+
+# ─── Payloads ─────────────────────────────────
+
+def build_payloads(seed):
+    """Deterministic request bodies per content type."""
+    rng = random.Random(seed)
+    payloads = {"text": [{"json": {"text": t}} for t in TEXT_SAMPLES]}
+
+    if HAS_PIL:
+        images = []
+        for i, size in enumerate((256, 512, 1024)):
+            pixels = np.random.default_rng(rng.randrange(2**32)).integers(0, 255, (size, size, 3), dtype=np.uint8)
+            buf = io.BytesIO()
+            Image.fromarray(pixels).save(buf, "PNG")
+            images.append({"files": {"file": (f"load_{i}.png", buf.getvalue(), "image/png")}})
+        payloads["image"] = images
+
+    if HAS_CV2 and HAS_PIL:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "load.mp4")
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), 24, (320, 240))
+            yy, xx = np.mgrid[0:240, 0:320]
+            for i in range(96):
+                frame = np.zeros((240, 320, 3), np.uint8)
+                frame[..., 0] = (xx + i * 3) % 256
+                frame[..., 1] = (yy + i) % 256
+                frame[..., 2] = 128
+                writer.write(frame)
+            writer.release()
+            with open(path, "rb") as f:
+                payloads["video"] = [{"files": {"file": ("load.mp4", f.read(), "video/mp4")}}]
+
+    return payloads
+
+
+def parse_mix(spec):
+    mix = {}
+    for part in spec.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in ("text", "image", "video"):
+            raise argparse.ArgumentTypeError(f"Unknown content type in mix: {kind!r}")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+# ─── Server ───────────────────────────────────
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, workers, model_latency_ms, model_jitter_ms, stats_dir):
+    env = dict(
+        os.environ,
+        LOADTEST_MODEL_LATENCY_MS=str(model_latency_ms),
+        LOADTEST_MODEL_JITTER_MS=str(model_jitter_ms),
+        LOADTEST_STATS_DIR=stats_dir,
+        RESULTS_DB_PATH=os.path.join(stats_dir, "results.db"),
+    )
+    cmd = [
+        sys.executable, "-m", "uvicorn", "benchmarks.loadtest_app:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning",
+    ]
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"Server exited during startup (code {proc.returncode})")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise SystemExit("Server did not become healthy within 60s")
+
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def read_lag(stats_dir):
+    """Merge per-worker lag reservoirs; returns (samples, exact max)."""
+    samples, worst = [], 0.0
+    for path in glob.glob(os.path.join(stats_dir, "lag-*.json")):
+        with open(path) as f:
+            stats = json.load(f)
+        samples.extend(stats["samples"])
+        worst = max(worst, stats["max"])
+    return samples, worst
+
+
+# ─── Load ─────────────────────────────────────
+
+async def drive(base_url, payloads, mix, concurrency, duration, requests, seed, timeout):
+    kinds = [k for k in mix if k in payloads]
+    weights = [mix[k] for k in kinds]
+    if not kinds:
+        raise SystemExit("No payloads available for the requested mix")
+
+    rng = random.Random(seed)
+    results = []
+    budget = {"left": requests}
+    deadline = time.monotonic() + duration
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+
+        async def user():
+            while time.monotonic() < deadline:
+                if requests:
+                    if budget["left"] <= 0:
+                        return
+                    budget["left"] -= 1
+                kind = rng.choices(kinds, weights)[0]
+                body = rng.choice(payloads[kind])
+                start = time.perf_counter()
+                try:
+                    response = await client.post(f"/api/analyze/{kind}", **body)
+                    ok = response.status_code == 200
+                    error = None if ok else f"HTTP {response.status_code}"
+                except httpx.HTTPError as e:
+                    ok, error = False, type(e).__name__
+                results.append((kind, (time.perf_counter() - start) * 1000, ok, error))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return results, elapsed
+
+
+# ─── Report ───────────────────────────────────
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def summarize(results, elapsed, lag, config):
+    def stats(rows):
+        latencies = [r[1] for r in rows if r[2]]
+        errors = sum(1 for r in rows if not r[2])
+        return {
+            "requests": len(rows),
+            "errors": errors,
+            "error_rate": errors / len(rows) if rows else 0.0,
+            "throughput_rps": len(rows) / elapsed if elapsed else 0.0,
+            "latency_ms": {
+                "p50": percentile(latencies, 50),
+                "p90": percentile(latencies, 90),
+                "p99": percentile(latencies, 99),
+                "max": max(latencies, default=0.0),
+            },
+        }
+
+    errors = {}
+    for r in results:
+        if r[3]:
+            errors[r[3]] = errors.get(r[3], 0) + 1
+
+    report = {
+        "config": config,
+        "elapsed_s": elapsed,
+        "overall": stats(results),
+        "by_type": {kind: stats([r for r in results if r[0] == kind]) for kind in sorted({r[0] for r in results})},
+        "errors": errors,
+    }
+    lag_samples, lag_max = lag
+    if lag_samples:
+        report["event_loop_lag_ms"] = {
+            "p50": percentile(lag_samples, 50),
+            "p99": percentile(lag_samples, 99),
+            "max": lag_max,
+            "mean": sum(lag_samples) / len(lag_samples),
+        }
+    return report
+
+
+def print_report(report):
+    o = report["overall"]
+    c = report["config"]
+    print(f"\nconcurrency {c['concurrency']}, server workers {c['workers']}, "
+          f"stub latency {c['model_latency_ms']} ms, {report['elapsed_s']:.1f}s")
+    print(f"requests {o['requests']}  errors {o['errors']} ({o['error_rate']:.2%})  "
+          f"throughput {o['throughput_rps']:.1f} req/s")
+    print(f"\n{'type':<8}{'req':>8}{'req/s':>9}{'err%':>8}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  (ms)")
+    for kind, s in [("all", o), *report["by_type"].items()]:
+        lat = s["latency_ms"]
+        print(f"{kind:<8}{s['requests']:>8}{s['throughput_rps']:>9.1f}{s['error_rate'] * 100:>8.2f}"
+              f"{lat['p50']:>9.1f}{lat['p90']:>9.1f}{lat['p99']:>9.1f}{lat['max']:>9.1f}")
+    if "event_loop_lag_ms" in report:
+        lag = report["event_loop_lag_ms"]
+        print(f"\nserver event-loop lag: mean {lag['mean']:.1f}  p50 {lag['p50']:.1f}  "
+              f"p99 {lag['p99']:.1f}  max {lag['max']:.1f} ms")
+    for error, count in report["errors"].items():
+        print(f"  {count:>6} × {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest", description="Load-test the analysis API.")
+    parser.add_argument("--url", default=None, help="Target an already running server instead of starting one")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent in-flight requests")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run")
+    parser.add_argument("--requests", type=int, default=0, help="Stop after this many requests (0 = duration only)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("text=6,image=3,video=1"))
+    parser.add_argument("--model-latency-ms", type=float, default=50.0, help="Stub text model inference time")
+    parser.add_argument("--model-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    payloads = build_payloads(args.seed)
+    missing = [k for k in args.mix if k not in payloads]
+    if missing:
+        print(f"[loadtest] skipping {', '.join(missing)}: payload generation needs Pillow/OpenCV", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as stats_dir:
+        proc = None
+        base_url = args.url
+        if base_url is None:
+            port = _free_port()
+            proc = start_server(port, args.workers, args.model_latency_ms, args.model_jitter_ms, stats_dir)
+            base_url = f"http://127.0.0.1:{port}"
+        try:
+            results, elapsed = asyncio.run(drive(
+                base_url, payloads, args.mix, args.concurrency, args.duration,
+                args.requests, args.seed, args.timeout,
+            ))
+        finally:
+            if proc is not None:
+                stop_server(proc)
+        lag = read_lag(stats_dir)
+
+    config = {
+        "url": args.url,
+        "workers": args.workers if args.url is None else None,
+        "concurrency": args.concurrency,
+        "mix": args.mix,
+        "model_latency_ms": args.model_latency_ms,
+        "model_jitter_ms": args.model_jitter_ms,
+    }
+    report = summarize(results, elapsed, lag, config)
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["overall"]["requests"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
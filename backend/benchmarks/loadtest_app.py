@@ -0,0 +1,88 @@
+"""
+Load-test server entry point: app.main with a deterministic stub in place of the RoBERTa pipeline.
+
+    uvicorn benchmarks.loadtest_app:app --workers 4
+
+Configured through environment variables so every uvicorn worker picks it up:
+    LOADTEST_MODEL_LATENCY_MS   blocking time per stub inference (default 50)
+    LOADTEST_MODEL_JITTER_MS    deterministic ± spread around that latency (default 0)
+    LOADTEST_STATS_DIR          where each worker writes its event-loop lag samples
+"""
+
+import os
+
+# Must be set before app.services.text_analyzer is imported
+os.environ["TEXT_DETECTOR_MODEL"] = ""
+
+import json
+import time
+import random
+import asyncio
+from contextlib import asynccontextmanager
+
+from app.main import app
+from app.services import text_analyzer
+from benchmarks.stub_detector import StubDetector
+
+LAG_INTERVAL = 0.01
+MAX_LAG_SAMPLES = 100_000
+
+
+text_analyzer.ai_detector = StubDetector(
+    float(os.getenv("LOADTEST_MODEL_LATENCY_MS", "50")),
+    float(os.getenv("LOADTEST_MODEL_JITTER_MS", "0")),
+)
+text_analyzer.HAS_MODEL = True
+text_analyzer.MODEL_NAME = "loadtest-stub"
+text_analyzer.TextAnalyzer.VERSION = "1.0.0+loadtest-stub"
+
+
+async def _monitor_lag(path):
+    """Sample how late a short sleep wakes up; the overshoot is time the loop was blocked.
+
+    Samples stay in memory, as a uniform reservoir once MAX_LAG_SAMPLES is reached, and
+    are written once at shutdown, so the monitor does no I/O on the loop it is timing.
+    """
+    samples = []
+    count = 0
+    worst = 0.0
+    rng = random.Random(os.getpid())
+    try:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(LAG_INTERVAL)
+            lag = max(0.0, time.perf_counter() - start - LAG_INTERVAL) * 1000
+            count += 1
+            worst = max(worst, lag)
+            if len(samples) < MAX_LAG_SAMPLES:
+                samples.append(lag)
+            else:
+                slot = rng.randrange(count)
+                if slot < MAX_LAG_SAMPLES:
+                    samples[slot] = lag
+    finally:
+        if path:
+            with open(path, "w") as f:
+                json.dump({"count": count, "max": worst, "samples": samples}, f)
+
+
+_app_lifespan = app.router.lifespan_context
+
+
+@asynccontextmanager
+async def _lifespan(app):
+    stats_dir = os.getenv("LOADTEST_STATS_DIR")
+    path = os.path.join(stats_dir, f"lag-{os.getpid()}.json") if stats_dir else None
+    async with _app_lifespan(app) as state:
+        task = asyncio.create_task(_monitor_lag(path))
+        try:
+            yield state
+        finally:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+app.router.lifespan_context = _lifespan
@@ -0,0 +1,103 @@
+"""
+Serialization benchmark: legacy dict → AnalysisResponse validation vs typed results.
+
+    cd backend && python -m benchmarks.serialization [--iterations 20000]
+
+The legacy path mirrors what the routes did before: build AnalysisResponse from the
+analyzer dict, let the response_model validate it again, dump to JSON-compatible
+Python and encode with json.dumps.
+"""
+
+import json
+import time
+import argparse
+
+import numpy as np
+from pydantic import TypeAdapter
+
+from app.api.schemas import AnalysisResponse
+from app.models.results import AnalysisResult, Signal, HAS_ORJSON
+
+
+def sample_result():
+    signals = [
+        Signal("video.low_coherence", "high", "Score: 0.712 (natural: >0.85)"),
+        Signal("video.uniform_quality", "medium", "Variance: 3.18"),
+        Signal("video.faces_consistent", "low", "Found in 12 frames"),
+        Signal("video.color_shift", "medium", "Consistency: 0.774"),
+        Signal("video.encoding_metadata", "low", "clip_0042.mp4"),
+    ]
+    metrics = {
+        "file_size_mb": 18.42,
+        "filename": "clip_0042.mp4",
+        "file_hash": "9f2c1e0b7a4d8e31",
+        "frames_analyzed": 50,
+        "fps": np.float64(29.97),
+        "resolution": "1920×1080",
+        "temporal_coherence": np.float64(0.712),
+        "codec": "avc1",
+        "working_resolution": "1280×720",
+        "frames_planned": 50,
+        "refined_frames": 0,
+        "frame_budget_ms": 5000,
+        "frame_time_ms": 3120,
+        "within_budget": True,
+    }
+    return AnalysisResult(
+        prediction="ai_generated",
+        ai_probability=72.0,
+        human_probability=28.0,
+        signals=signals,
+        metrics=metrics,
+        content_type="video",
+        processing_time_ms=3310,
+    )
+
+
+def legacy_dict(result):
+    data = result.to_dict()
+    data.pop("disclaimer")
+    return data
+
+
+def bench(fn, iterations):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    result = sample_result()
+    legacy_result = legacy_dict(result)
+    adapter = TypeAdapter(AnalysisResponse)
+
+    def legacy():
+        response = AnalysisResponse(**legacy_result)
+        payload = adapter.dump_python(adapter.validate_python(response), mode="json")
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def typed_full():
+        return result.to_json()
+
+    def typed_compact():
+        return result.to_json(compact=True)
+
+    encoder = "orjson" if HAS_ORJSON else "json (orjson not installed)"
+    print(f"encoder: {encoder}, iterations: {args.iterations}")
+    print(f"{'path':<34}{'µs/op':>10}{'bytes':>10}")
+    for name, fn in [
+        ("legacy pydantic + json.dumps", legacy),
+        ("typed result, full", typed_full),
+        ("typed result, compact", typed_compact),
+    ]:
+        print(f"{name:<34}{bench(fn, args.iterations):>10.1f}{len(fn()):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Stub text model for the load test (installed by loadtest_app.py). No import side effects.
+"""
+
+import time
+import hashlib
+
+
+class StubDetector:
+    """Deterministic stand-in for the transformers text-classification pipeline.
+
+    Sleeps (blocking, like real CPU inference) and derives the label and score
+    from a hash of the input, so identical traffic yields identical verdicts.
+    """
+
+    def __init__(self, latency_ms=50.0, jitter_ms=0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+
+    def __call__(self, text):
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        u = int.from_bytes(digest[:4], "big") / 2**32
+        delay_ms = self.latency_ms + self.jitter_ms * (2 * u - 1)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+        return [{"label": "LABEL_1" if u >= 0.5 else "LABEL_0", "score": 0.5 + abs(u - 0.5)}]
@@ -0,0 +1,133 @@
+import io
+import os
+import json
+import tarfile
+import zipfile
+
+import pytest
+from PIL import Image
+
+from app import batch
+
+TEXT = "The committee met on Tuesday and postponed most decisions because of the storm. " * 2
+
+
+def _crashy_analyze(source, kind, mime, path, data):
+    if source.endswith("crash.txt"):
+        os._exit(1)
+    return _real_analyze(source, kind, mime, path, data)
+
+
+_real_analyze = batch._analyze
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    root = tmp_path / "corpus"
+    (root / "sub").mkdir(parents=True)
+    (root / "a.txt").write_text(TEXT)
+    (root / "sub" / "b.md").write_text(TEXT)
+    (root / "ignored.bin").write_bytes(b"\x00")
+    buf = io.BytesIO()
+    Image.new("RGB", (32, 32), (200, 10, 10)).save(buf, "PNG")
+    (root / "sub" / "c.png").write_bytes(buf.getvalue())
+
+    with zipfile.ZipFile(tmp_path / "docs.zip", "w") as zf:
+        zf.writestr("inner/z.txt", TEXT)
+        zf.writestr("inner/skip.exe", b"MZ")
+    with tarfile.open(tmp_path / "media.tar.gz", "w:gz") as tf:
+        tf.add(root / "sub" / "c.png", arcname="t/c.png")
+        tf.add(root / "a.txt", arcname="t/a.txt")
+    return tmp_path
+
+
+def read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_discovers_directories_zip_and_tar(corpus):
+    paths = [str(corpus / "corpus"), str(corpus / "docs.zip"), str(corpus / "media.tar.gz")]
+    items = {source: (kind, data) for source, kind, _, _, data in batch.iter_items(paths)}
+
+    names = {os.path.relpath(s, corpus) for s in items}
+    assert names == {
+        "corpus/a.txt",
+        "corpus/sub/b.md",
+        "corpus/sub/c.png",
+        "docs.zip!inner/z.txt",
+        "media.tar.gz!t/c.png",
+        "media.tar.gz!t/a.txt",
+    }
+    assert items[str(corpus / "corpus" / "a.txt")][1] is None
+    assert items[f"{corpus / 'docs.zip'}!inner/z.txt"][0] == "text"
+    assert items[f"{corpus / 'media.tar.gz'}!t/c.png"][0] == "image"
+
+
+def test_resume_drops_uncheckpointed_output(corpus):
+    paths = [str(corpus / "corpus"), str(corpus / "docs.zip")]
+    output = str(corpus / "out.jsonl")
+    stats = batch.run(paths, output, workers=1, flush_every=1)
+    assert stats["processed"] == 4
+
+    # Simulate a hard kill: a result that reached disk without a checkpoint commit,
+    # and a torn commit line for it.
+    with open(output, "a") as f:
+        f.write(json.dumps({"source": "stray", "response": {}}) + "\n")
+    with open(output + ".checkpoint", "a") as f:
+        f.write('{"position": 99999, "sources": ["str')
+
+    stats = batch.run(paths + [str(corpus / "media.tar.gz")], output, workers=1)
+    assert stats["resumed"] == 4
+    assert stats["processed"] == 2
+
+    sources = [r["source"] for r in read_jsonl(output)]
+    assert len(sources) == len(set(sources)) == 6
+    assert "stray" not in sources
+
+
+def test_crashed_worker_is_isolated(corpus, monkeypatch):
+    (corpus / "corpus" / "crash.txt").write_text(TEXT)
+    monkeypatch.setattr(batch, "_analyze", _crashy_analyze)
+
+    output = str(corpus / "out.jsonl")
+    stats = batch.run([str(corpus / "corpus")], output, workers=2)
+
+    records = {os.path.basename(r["source"]): r for r in read_jsonl(output)}
+    assert set(records) == {"a.txt", "b.md", "c.png", "crash.txt"}
+    assert records["crash.txt"]["error"] == "worker process crashed"
+    assert all("error" not in r for name, r in records.items() if name != "crash.txt")
+    assert stats["pool_restarts"] >= 1
+
+
+def test_broken_archives_become_error_rows(corpus):
+    (corpus / "corpus" / "broken.zip").write_bytes(b"PK\x03\x04 not really a zip")
+    with open(corpus / "media.tar.gz", "rb") as f:
+        data = f.read()
+    (corpus / "corpus" / "cut.tar.gz").write_bytes(data[: len(data) // 2])
+
+    output = str(corpus / "out.jsonl")
+    stats = batch.run([str(corpus / "corpus")], output, workers=2)
+
+    records = {os.path.relpath(r["source"], corpus / "corpus"): r for r in read_jsonl(output)}
+    assert {"a.txt", "sub/b.md", "sub/c.png", "broken.zip", "cut.tar.gz"} <= set(records)
+    assert records["broken.zip"]["error"].startswith("Unreadable archive")
+    assert "error" in records["cut.tar.gz"]
+    assert "error" not in records["a.txt"]
+    assert stats["processed"] == len(records)
+
+    # The rerun skips the broken archives instead of failing on them again.
+    stats = batch.run([str(corpus / "corpus")], output, workers=2)
+    assert stats["processed"] == 0
+    assert stats["resumed"] == len(records)
+
+
+def test_oversized_files_are_not_read(corpus):
+    paths = [str(corpus / "corpus"), str(corpus / "docs.zip"), str(corpus / "media.tar.gz")]
+    output = str(corpus / "out.jsonl")
+    stats = batch.run(paths, output, workers=1, max_size=len(TEXT) - 1)
+
+    records = {os.path.relpath(r["source"], corpus): r for r in read_jsonl(output)}
+    too_large = {name for name, r in records.items() if r.get("error", "").startswith("File too large")}
+    assert too_large == {"corpus/a.txt", "corpus/sub/b.md", "docs.zip!inner/z.txt", "media.tar.gz!t/a.txt"}
+    assert stats["failed"] == len(too_large)
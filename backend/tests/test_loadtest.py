@@ -0,0 +1,81 @@
+import json
+import argparse
+
+import pytest
+
+from benchmarks import stub_detector
+from benchmarks.loadtest import parse_mix, percentile, read_lag, summarize
+from benchmarks.stub_detector import StubDetector
+
+
+def test_stub_detector_is_deterministic(monkeypatch):
+    delays = []
+    monkeypatch.setattr(stub_detector.time, "sleep", delays.append)
+    detector = StubDetector(latency_ms=50, jitter_ms=20)
+
+    first = detector("the same input")
+    second = detector("the same input")
+    other = detector("a different input")
+
+    assert first == second
+    assert first[0]["label"] in ("LABEL_0", "LABEL_1")
+    assert 0.5 <= first[0]["score"] <= 1.0
+    assert delays[0] == delays[1]
+    assert all(0.030 <= d <= 0.070 for d in delays)
+    assert (other, delays[2]) != (first, delays[0])
+
+
+def test_stub_detector_zero_latency_does_not_sleep(monkeypatch):
+    monkeypatch.setattr(stub_detector.time, "sleep", lambda s: pytest.fail("slept"))
+    StubDetector(latency_ms=0)("text")
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile([], 50) == 0.0
+    assert percentile([7.0], 99) == 7.0
+    assert percentile(values, 50) == 51
+    assert percentile(values, 99) == 100
+    assert percentile(values, 100) == 100
+    assert percentile(list(reversed(values)), 90) == 91
+
+
+def test_parse_mix():
+    assert parse_mix("text=6, image=3,video") == {"text": 6.0, "image": 3.0, "video": 1.0}
+    with pytest.raises(argparse.ArgumentTypeError, match="audio"):
+        parse_mix("text=1,audio=2")
+
+
+def test_read_lag_merges_workers_with_exact_max(tmp_path):
+    # Worker 1's worst sample fell out of its reservoir; the recorded max must still win.
+    (tmp_path / "lag-1.json").write_text(json.dumps({"count": 500, "max": 250.0, "samples": [1.0, 2.0]}))
+    (tmp_path / "lag-2.json").write_text(json.dumps({"count": 3, "max": 9.0, "samples": [3.0, 9.0, 4.0]}))
+    (tmp_path / "results.db").write_text("")
+
+    samples, worst = read_lag(str(tmp_path))
+    assert sorted(samples) == [1.0, 2.0, 3.0, 4.0, 9.0]
+    assert worst == 250.0
+    assert read_lag(str(tmp_path / "missing")) == ([], 0.0)
+
+
+def test_summarize():
+    results = [
+        ("text", 10.0, True, None),
+        ("text", 30.0, True, None),
+        ("image", 50.0, False, "HTTP 500"),
+        ("image", 20.0, True, None),
+    ]
+    report = summarize(results, 2.0, ([1.0, 3.0], 40.0), {"concurrency": 4})
+
+    overall = report["overall"]
+    assert overall["requests"] == 4
+    assert overall["errors"] == 1
+    assert overall["error_rate"] == 0.25
+    assert overall["throughput_rps"] == 2.0
+    assert overall["latency_ms"]["max"] == 30.0  # failed requests are excluded from latency
+    assert report["by_type"]["image"]["errors"] == 1
+    assert report["by_type"]["text"]["latency_ms"]["p50"] == 30.0
+    assert report["errors"] == {"HTTP 500": 1}
+    assert report["event_loop_lag_ms"] == {"p50": 3.0, "p99": 3.0, "max": 40.0, "mean": 2.0}
+
+    assert "event_loop_lag_ms" not in summarize(results, 2.0, ([], 0.0), {})
@@ -0,0 +1,179 @@
+import time
+import json
+import asyncio
+import hashlib
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.concurrency import iterate_in_threadpool
+
+from app import main
+from app.api import routes
+from app.models.results import AnalysisResult, Signal
+from app.services.result_store import ResultStore, store_from_env
+
+
+def make_result(prediction="ai_generated", content_type="text"):
+    return AnalysisResult(
+        prediction=prediction,
+        ai_probability=80.0,
+        human_probability=20.0,
+        signals=[Signal("text.low_burstiness", "high", "Score: 1.20")],
+        metrics={"word_count": 42},
+        content_type=content_type,
+        processing_time_ms=12,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(str(tmp_path / "results.db"), flush_interval=0.05)
+    store.start()
+    yield store
+    store.close()
+
+
+def test_database_created_on_start_not_construction(tmp_path):
+    path = tmp_path / "results.db"
+    store = ResultStore(str(path))
+    assert not path.exists()
+    store.start()
+    store.close()
+    assert path.exists()
+
+
+def test_store_disabled_without_env(monkeypatch):
+    monkeypatch.delenv("RESULTS_DB_PATH", raising=False)
+    assert store_from_env() is None
+
+
+def test_round_trip(store):
+    store.record("a" * 64, "1.0.0", make_result())
+    store.record("b" * 64, "1.0.0", make_result("human_created", "image"))
+    store.close()
+
+    rows = store.find_by_hash("a" * 64)
+    assert len(rows) == 1
+    assert rows[0]["analyzer_version"] == "1.0.0"
+    assert rows[0]["response"]["signals"][0]["label"] == "Low burstiness — unnaturally uniform sentence flow"
+    assert rows[0]["response"]["metrics"] == {"word_count": 42}
+
+    created = rows[0]["created_at"]
+    assert len(store.find_by_time(since=created - 1)) == 2
+    assert store.find_by_time(until=created) == []
+    assert [r["content_hash"] for r in store.export()] == ["a" * 64, "b" * 64]
+
+
+def test_append_only(store):
+    store.record("a" * 64, "1.0.0", make_result())
+    store.close()
+
+    conn = sqlite3.connect(store.path)
+    try:
+        with pytest.raises(sqlite3.IntegrityError, match="append-only"):
+            conn.execute("UPDATE analyses SET prediction = 'human_created'")
+        with pytest.raises(sqlite3.IntegrityError, match="append-only"):
+            conn.execute("DELETE FROM analyses")
+    finally:
+        conn.close()
+
+
+def test_concurrent_exports(store):
+    for i in range(50):
+        store.record(f"{i:064x}", "1.0.0", make_result())
+    store.close()
+
+    async def consume():
+        return [row async for row in iterate_in_threadpool(store.export(chunk_size=7))]
+
+    async def run_all():
+        return await asyncio.gather(*(consume() for _ in range(20)))
+
+    results = asyncio.run(run_all())
+    assert all(len(rows) == 50 for rows in results)
+
+
+def test_write_failure_is_counted_and_writer_survives(store):
+    broken = make_result()
+    broken.metrics = {"bad": object()}
+    store.record("a" * 64, "1.0.0", broken)
+    store.record("b" * 64, "1.0.0", make_result())
+    store.close()
+
+    assert store.stats()["failed"] == 1
+    assert len(store.find_by_hash("b" * 64)) == 1
+
+
+# ─── API ──────────────────────────────────────
+
+TEXT = "The committee met on Tuesday and postponed most decisions because of the storm."
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    monkeypatch.setenv("RESULTS_DB_PATH", str(tmp_path / "api.db"))
+    store = store_from_env()
+    monkeypatch.setattr(routes, "result_store", store)
+    monkeypatch.setattr(main, "result_store", store)
+    with TestClient(main.app) as client:
+        yield client, store
+
+
+def analyze(client, store, text):
+    assert client.post("/api/analyze/text", json={"text": text}).status_code == 200
+    store.close()  # flush the writer so the row is queryable
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def test_api_lookup_by_hash_is_case_insensitive(api):
+    client, store = api
+    content_hash = analyze(client, store, TEXT)
+
+    rows = client.get(f"/api/results/{content_hash.upper()}").json()
+    assert [r["content_hash"] for r in rows] == [content_hash]
+    assert rows[0]["content_type"] == "text"
+    assert client.get(f"/api/results/{'0' * 64}").json() == []
+
+
+def test_api_time_filters(api):
+    client, store = api
+    first = analyze(client, store, TEXT)
+    cutoff = time.time()
+    time.sleep(0.01)
+    second = analyze(client, store, TEXT + " Again.")
+
+    assert [r["content_hash"] for r in client.get("/api/results", params={"since": cutoff}).json()] == [second]
+    assert [r["content_hash"] for r in client.get("/api/results", params={"until": cutoff}).json()] == [first]
+    assert len(client.get("/api/results").json()) == 2
+
+
+def test_api_export_streams_ndjson(api):
+    client, store = api
+    first = analyze(client, store, TEXT)
+    second = analyze(client, store, TEXT + " Again.")
+
+    # /results/export must not be captured by /results/{content_hash}
+    response = client.get("/api/results/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["content_hash"] for r in rows] == [first, second]
+
+
+def test_api_health_does_not_expose_path(api):
+    client, store = api
+    stats = client.get("/health").json()["result_store"]
+    assert stats["writer_alive"] is True
+    assert "path" not in stats
+    assert store.path not in json.dumps(stats)
+
+
+@pytest.mark.parametrize("url", ["/api/results", "/api/results/export", f"/api/results/{'a' * 64}"])
+def test_api_results_404_when_disabled(monkeypatch, url):
+    monkeypatch.setattr(routes, "result_store", None)
+    monkeypatch.setattr(main, "result_store", None)
+    with TestClient(main.app) as client:
+        response = client.get(url)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Result store is disabled"
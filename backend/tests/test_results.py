@@ -0,0 +1,73 @@
+import io
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.main import app
+from app.models import results
+from app.models.results import AnalysisResult, Signal, SIGNAL_LABELS, DISCLAIMER
+
+
+def make_result():
+    return AnalysisResult(
+        prediction="uncertain",
+        ai_probability=55.0,
+        human_probability=45.0,
+        signals=[Signal("video.low_coherence", "high", "Score: 0.712 (natural: >0.85)")],
+        metrics={"temporal_coherence": np.float64(0.712), "frames_analyzed": np.int64(50), "within_budget": True},
+        content_type="video",
+        processing_time_ms=8,
+    )
+
+
+def test_full_and_compact_shapes():
+    full = json.loads(make_result().to_json())
+    compact = json.loads(make_result().to_json(compact=True))
+
+    assert full["signals"] == [{"label": "Low temporal coherence", "weight": "high", "detail": "Score: 0.712 (natural: >0.85)"}]
+    assert full["disclaimer"] == DISCLAIMER
+    assert compact["signals"] == [{"code": "video.low_coherence", "weight": "high", "detail": "Score: 0.712 (natural: >0.85)"}]
+    assert "disclaimer" not in compact
+    assert {k: v for k, v in full.items() if k not in ("signals", "disclaimer")} == \
+        {k: v for k, v in compact.items() if k != "signals"}
+
+
+def test_unknown_signal_code_rejected():
+    with pytest.raises(ValueError):
+        Signal("video.nope", "low")
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_numpy_metrics_serialize(monkeypatch, use_orjson):
+    if use_orjson and not results.HAS_ORJSON:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(results, "HAS_ORJSON", use_orjson)
+
+    metrics = json.loads(make_result().to_json())["metrics"]
+    assert metrics == {"temporal_coherence": 0.712, "frames_analyzed": 50, "within_budget": True}
+
+
+def test_compact_image_signals_keep_dynamic_detail():
+    buf = io.BytesIO()
+    Image.new("RGB", (1024, 1024), (40, 40, 40)).save(buf, "PNG")
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/analyze/image?compact=true",
+            files={"file": ("midjourney_out.png", buf.getvalue(), "image/png")},
+        )
+        catalogue = client.get("/api/signals").json()
+    assert response.status_code == 200
+
+    signals = {s["code"]: s["detail"] for s in response.json()["signals"]}
+    assert signals["image.filename_generator"] == "'midjourney' in midjourney_out.png"
+    assert signals["image.ai_resolution"].startswith("1024×1024")
+    assert catalogue == SIGNAL_LABELS
+
+
+def test_openapi_documents_both_shapes():
+    schema = app.openapi()["paths"]["/api/analyze/text"]["post"]["responses"]["200"]["content"]["application/json"]["schema"]
+    refs = {option["$ref"].rsplit("/", 1)[-1] for option in schema["anyOf"]}
+    assert refs == {"AnalysisResponse", "CompactAnalysisResponse"}
@@ -0,0 +1,118 @@
+import tempfile
+
+import cv2
+import numpy as np
+import pytest
+
+from app.services.video_analyzer import VideoAnalyzer
+
+
+@pytest.fixture
+def analyzer():
+    return VideoAnalyzer()
+
+
+@pytest.mark.parametrize("total_frames, expected", [(-1, 0), (0, 0), (1, 1), (2, 2)])
+def test_plan_tiny_frame_counts(analyzer, total_frames, expected):
+    plan = analyzer._plan_sampling(1280, 720, total_frames, "avc1", 5000, False)
+    assert plan["frames"] == expected
+
+
+def test_plan_keeps_native_resolution_for_1080p(analyzer):
+    plan = analyzer._plan_sampling(1920, 1080, 9000, "avc1", 5000, False)
+    assert plan["scale"] == 1.0
+    assert plan["working_size"] == (1920, 1080)
+    assert analyzer.MIN_NATIVE_FRAMES <= plan["frames"] <= analyzer.MAX_FRAMES
+
+
+def test_plan_short_low_res_clip_uses_every_frame(analyzer):
+    plan = analyzer._plan_sampling(640, 480, 30, "avc1", 5000, False)
+    assert plan["frames"] == 30
+    assert plan["scale"] == 1.0
+
+
+def test_plan_8k_av1_downscales_but_keeps_two_frames(analyzer):
+    plan = analyzer._plan_sampling(7680, 4320, 100_000, "av01", 5000, False)
+    assert plan["scale"] < 1.0
+    assert plan["working_size"][1] in analyzer.WORKING_HEIGHTS
+    assert plan["frames"] >= 2
+
+    starved = analyzer._plan_sampling(7680, 4320, 100_000, "av01", 1, False)
+    assert starved["frames"] == 2
+
+
+def test_plan_refine_reserves_budget(analyzer):
+    plain = analyzer._plan_sampling(1920, 1080, 9000, "avc1", 5000, False)
+    refined = analyzer._plan_sampling(1920, 1080, 9000, "avc1", 5000, True)
+    assert refined["base_budget_ms"] == pytest.approx(5000 * (1 - analyzer.REFINE_BUDGET_SHARE))
+    assert refined["frames"] < plain["frames"]
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 8, 9, 50])
+def test_progressive_order_is_a_permutation(n):
+    order = VideoAnalyzer._progressive_order(n)
+    assert sorted(order) == list(range(n))
+    if n >= 3:
+        assert order[:3] == [0, n - 1, (n - 1) // 2]
+
+
+@pytest.fixture
+def clip(tmp_path):
+    path = str(tmp_path / "clip.mp4")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), 24, (160, 120))
+    yy, xx = np.mgrid[0:120, 0:160]
+    for i in range(40):
+        frame = np.zeros((120, 160, 3), np.uint8)
+        frame[..., 0] = (xx + i * 2) % 256
+        frame[..., 1] = yy % 256
+        writer.write(frame)
+    writer.release()
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_analyze_reports_budget_metrics(analyzer, clip):
+    result = analyzer.analyze(clip, "clip.mp4", budget_ms=5000, refine=True)
+
+    metrics = result.metrics
+    assert metrics["frame_budget_ms"] == 5000
+    assert metrics["working_resolution"] == "160×120"
+    assert 2 <= metrics["frames_analyzed"] <= metrics["frames_planned"] + metrics["refined_frames"]
+    assert isinstance(metrics["within_budget"], bool)
+
+
+def test_plan_unknown_dimensions_keep_native_frames(analyzer):
+    plan = analyzer._plan_sampling(0, 0, 300, "", 5000, False)
+    assert plan["scale"] == 1.0
+    assert plan["working_size"] == (0, 0)
+    assert plan["frames"] == analyzer.MAX_FRAMES
+
+
+def test_analyze_reads_size_from_first_frame_when_unreported(analyzer, clip, monkeypatch):
+    real_capture = cv2.VideoCapture
+
+    class NoSizeCapture:
+        def __init__(self, path):
+            self._cap = real_capture(path)
+
+        def get(self, prop):
+            if prop in (cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT):
+                return 0.0
+            return self._cap.get(prop)
+
+        def __getattr__(self, name):
+            return getattr(self._cap, name)
+
+    monkeypatch.setattr(cv2, "VideoCapture", NoSizeCapture)
+    metrics = analyzer.analyze(clip, "clip.mp4").metrics
+    assert metrics["resolution"] == "160×120"
+    assert metrics["working_resolution"] == "160×120"
+
+
+def test_temp_file_failure_falls_back_to_basic_mode(analyzer, clip, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", fail)
+    result = analyzer.analyze(clip, "clip.mp4")
+    assert [s.code for s in result.signals if s.code == "video.basic_mode"] == ["video.basic_mode"]